@@ -0,0 +1,106 @@
+"""
+Memory-adaptive execution.
+
+DuckDB fails a statement that does not fit into max_memory (and the spill limit of temp_directory) with an out
+of memory error. Instead of failing the job, the work is retried with less memory-hungry settings:
+
+1. insertion order preservation is disabled (only when the caller does not need the order),
+2. the work is split into 2, 4, 8, ... partitions executed one after another.
+"""
+
+import logging
+import time
+from typing import Callable
+
+import duckdb
+from keboola.component.exceptions import UserException
+
+MAX_PARTITIONS = 64
+
+
+def is_out_of_memory(error: Exception) -> bool:
+    # errors of the remote MotherDuck execution do not always keep the exception type
+    return isinstance(error, duckdb.OutOfMemoryException) or "out of memory" in str(error).lower()
+
+
+class AdaptiveExecutor:
+    def __init__(
+        self,
+        connection: duckdb.DuckDBPyConnection,
+        allow_unordered: bool = True,
+        transactional: bool = False,
+        max_partitions: int = MAX_PARTITIONS,
+    ):
+        """
+        Args:
+            connection: DuckDB connection the work is executed on.
+            allow_unordered: Whether insertion order preservation may be disabled.
+            transactional: Run each attempt in a transaction, so that a failed attempt leaves no partial data.
+            max_partitions: The maximum number of partitions the work is split into.
+        """
+        self.connection = connection
+        self.allow_unordered = allow_unordered
+        self.transactional = transactional
+        self.max_partitions = max_partitions
+        self.metrics = {"attempts": 0, "partitions": 1, "fallbacks": [], "duration_s": 0.0}
+
+    def execute(self, run: Callable[[int], None]) -> None:
+        """
+        Executes the work, retrying it with smaller work units on out of memory errors.
+
+        Args:
+            run: Executes the whole work split into the given number of partitions.
+        """
+        start = time.time()
+        partitions = 1
+
+        while True:
+            self.metrics["attempts"] += 1
+            try:
+                self._run_attempt(run, partitions)
+                break
+            except duckdb.Error as e:
+                if not is_out_of_memory(e):
+                    raise
+                logging.warning(f"Out of memory with {partitions} partition(s): {e}")
+                partitions = self._fall_back(partitions, e)
+
+        self.metrics["partitions"] = partitions
+        self.metrics["duration_s"] = round(time.time() - start, 2)
+        if self.metrics["fallbacks"]:
+            logging.info(f"Execution succeeded after falling back to: {', '.join(self.metrics['fallbacks'])}")
+
+    def _run_attempt(self, run: Callable[[int], None], partitions: int) -> None:
+        if not self.transactional:
+            run(partitions)
+            return
+
+        self.connection.execute("BEGIN TRANSACTION;")
+        try:
+            run(partitions)
+            self.connection.execute("COMMIT;")
+        except Exception:
+            try:
+                self.connection.execute("ROLLBACK;")
+            except duckdb.TransactionException:
+                pass  # already rolled back, e.g. by a failed commit
+            raise
+
+    def _fall_back(self, partitions: int, error: Exception) -> int:
+        """
+        Switches to the next, less memory-hungry execution and returns the number of partitions to use.
+        """
+        preserve_order = self.connection.execute("SELECT current_setting('preserve_insertion_order')").fetchone()[0]
+        if self.allow_unordered and preserve_order:
+            self.connection.execute("SET preserve_insertion_order = false;")
+            self.metrics["fallbacks"].append("preserve_insertion_order=false")
+            return partitions
+
+        if partitions * 2 > self.max_partitions:
+            raise UserException(
+                f"Out of memory even when split into {partitions} partition(s). "
+                f"Please increase max_memory or max_spill_size. Error: {error}"
+            ) from error
+
+        self.metrics["fallbacks"].append(f"partitions={partitions * 2}")
+        return partitions * 2
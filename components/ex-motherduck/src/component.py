@@ -1,7 +1,9 @@
 import logging
 import os
+import shutil
 import time
 from collections import OrderedDict
+from functools import partial
 
 import duckdb
 import polars
@@ -10,7 +12,9 @@ from keboola.component.dao import ColumnDefinition, BaseType, SupportedDataTypes
 from keboola.component.exceptions import UserException
 from keboola.component.sync_actions import SelectElement, ValidationResult, MessageType
 
+from adaptive import MAX_PARTITIONS, AdaptiveExecutor
 from configuration import Configuration
+from extensions import get_extension_config
 
 DUCK_DB_DIR = os.path.join(os.environ.get("TMPDIR", "/tmp"), "duckdb")
 
@@ -53,27 +57,74 @@ class Component(ComponentBase):
             has_header=True,
         )
 
+        # all statements of an attempt read the same snapshot
+        executor = AdaptiveExecutor(self.db, transactional=True, max_partitions=self.get_max_partitions(table_path))
         try:
-            q = f"COPY ({query}) TO '{out_table.full_path}' (HEADER, DELIMITER ',', FORCE_QUOTE *)"
-            logging.debug(f"Running query: {q}; ")
-            start = time.time()
-            self.db.execute(q)
-            logging.debug(f"Query finished successfully in {time.time() - start:.2f} seconds")
+            executor.execute(partial(self.export, query, table_path, out_table.full_path))
         finally:
             self.db.close()
 
         self.write_manifest(out_table)
+        self.write_state_file({"metrics": executor.metrics})
 
         logging.debug(f"Execution time: {time.time() - start_time:.2f} seconds")
 
+    def get_max_partitions(self, table_path: str) -> int:
+        """
+        Only the whole table selected by the all_data and select_columns modes is split into partitions, by ranges
+        of its rowid. Custom queries may not be deterministic and views have no rowid, so they are not split.
+        """
+        if self.params.data_selection.mode == "custom_query":
+            return 1
+
+        try:
+            self.db.execute(f"SELECT rowid FROM {table_path} LIMIT 0")
+        except duckdb.BinderException:
+            logging.debug(f"{table_path} has no rowid, it will not be split into partitions.")
+            return 1
+        return MAX_PARTITIONS
+
+    def export(self, query: str, table_path: str, path: str, partitions: int) -> None:
+        """
+        Exports the query result into the CSV file. When split into partitions, the rows of each rowid range
+        of the table are exported separately and appended to the file.
+        """
+        first_rowid, last_rowid = None, None
+        if partitions > 1:
+            first_rowid, last_rowid = self.db.execute(f"SELECT min(rowid), max(rowid) FROM {table_path}").fetchone()
+
+        if first_rowid is None:
+            self._copy(query, path, header=True)
+            return
+
+        size = (last_rowid - first_rowid) // partitions + 1
+        with open(path, "wb") as out_file:
+            for partition in range(partitions):
+                partition_path = os.path.join(DUCK_DB_DIR, f"partition_{partition}.csv")
+                start = first_rowid + partition * size
+                # the query selects from the table only, the condition filters its rows
+                partition_query = f"{query} WHERE rowid >= {start} AND rowid < {start + size}"
+                self._copy(partition_query, partition_path, header=partition == 0)
+                with open(partition_path, "rb") as partition_file:
+                    shutil.copyfileobj(partition_file, out_file)
+                os.remove(partition_path)
+
+    def _copy(self, query: str, path: str, header: bool) -> None:
+        q = f"COPY ({query}) TO '{path}' (HEADER {header}, DELIMITER ',', FORCE_QUOTE *)"
+        logging.debug(f"Running query: {q}; ")
+        start = time.time()
+        self.db.execute(q)
+        logging.debug(f"Query finished successfully in {time.time() - start:.2f} seconds")
+
     def init_connection(self):
         os.makedirs(DUCK_DB_DIR, exist_ok=True)
 
         config = {
             "temp_directory": DUCK_DB_DIR,
-            "extension_directory": os.path.join(DUCK_DB_DIR, "extensions"),
+            **get_extension_config(fallback_dir=os.path.join(DUCK_DB_DIR, "extensions")),
             "threads": self.params.threads,
             "max_memory": f"{self.params.max_memory}MB",
+            "max_temp_directory_size": f"{self.params.max_spill_size}MB",
             "motherduck_token": self.params.token,
             "custom_user_agent": "keboola.ex-motherduck",
         }
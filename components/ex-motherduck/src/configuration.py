@@ -44,6 +44,7 @@ class Configuration(BaseModel):
     debug: bool = False
     threads: int = 1
     max_memory: int = 256
+    max_spill_size: int = 10240
 
     def __init__(self, **data):
         try:
@@ -1,10 +1,16 @@
 import os
+import tempfile
 import unittest
+from functools import partial
 
+import duckdb
 import mock
 from freezegun import freeze_time
+from keboola.component.exceptions import UserException
 
-from src.component import Component
+from src.adaptive import MAX_PARTITIONS, AdaptiveExecutor
+from src.component import DUCK_DB_DIR, Component
+from src.configuration import Configuration
 
 
 class TestComponent(unittest.TestCase):
@@ -18,6 +24,71 @@ class TestComponent(unittest.TestCase):
             comp.run()
 
 
+class TestExport(unittest.TestCase):
+    def setUp(self):
+        os.makedirs(DUCK_DB_DIR, exist_ok=True)
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.comp = Component.__new__(Component)
+        self.comp.params = Configuration(**{"#token": ""})
+        self.comp.db = duckdb.connect()
+        self.comp.db.execute("CREATE TABLE src AS SELECT i, 'row ' || i AS s FROM range(1000) t(i);")
+        # rowids with gaps
+        self.comp.db.execute("DELETE FROM src WHERE i % 7 = 0;")
+
+    def tearDown(self):
+        self.comp.db.close()
+        self.tmp_dir.cleanup()
+
+    def _export(self, query: str, partitions: int) -> list[str]:
+        path = os.path.join(self.tmp_dir.name, f"out_{partitions}.csv")
+        executor = AdaptiveExecutor(self.comp.db, transactional=True)
+        executor.execute(lambda _: self.comp.export(query, "src", path, partitions))
+        with open(path) as f:
+            return f.read().splitlines()
+
+    def test_partitioned_export_matches_single_export(self):
+        single = self._export("SELECT * FROM src", partitions=1)
+        partitioned = self._export("SELECT * FROM src", partitions=4)
+
+        self.assertEqual(partitioned[0], '"i","s"')
+        self.assertEqual(len(partitioned), 858)
+        self.assertEqual(single, partitioned)
+        # partition files are removed
+        self.assertFalse([f for f in os.listdir(DUCK_DB_DIR) if f.startswith("partition_")])
+
+    def test_partitioned_export_of_selected_columns(self):
+        partitioned = self._export("SELECT s FROM src", partitions=64)
+
+        self.assertEqual(partitioned, self._export("SELECT s FROM src", partitions=1))
+
+    def test_partitioned_export_of_empty_table(self):
+        self.comp.db.execute("DELETE FROM src;")
+
+        self.assertEqual(self._export("SELECT * FROM src", partitions=4), ['"i","s"'])
+
+    def test_only_tables_are_partitioned(self):
+        self.comp.db.execute("CREATE VIEW src_view AS SELECT * FROM src;")
+
+        self.assertEqual(self.comp.get_max_partitions("src"), MAX_PARTITIONS)
+        self.assertEqual(self.comp.get_max_partitions("src_view"), 1)
+
+        self.comp.params.data_selection.mode = "custom_query"
+        self.assertEqual(self.comp.get_max_partitions("src"), 1)
+
+    def test_custom_query_fails_instead_of_partitioning(self):
+        calls = []
+
+        def export(query: str, table_path: str, path: str, partitions: int) -> None:
+            calls.append(partitions)
+            raise duckdb.OutOfMemoryException("Out of Memory Error: failed to allocate data")
+
+        self.comp.params.data_selection.mode = "custom_query"
+        executor = AdaptiveExecutor(self.comp.db, max_partitions=self.comp.get_max_partitions("src"))
+        with self.assertRaises(UserException):
+            executor.execute(partial(export, "SELECT * FROM src USING SAMPLE 10", "src", "out.csv"))
+        self.assertEqual(calls, [1, 1])
+
+
 if __name__ == "__main__":
     # import sys;sys.argv = ['', 'Test.testName']
     unittest.main()
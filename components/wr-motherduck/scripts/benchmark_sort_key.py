@@ -0,0 +1,105 @@
+"""
+Benchmark of the destination sort key on a local DuckDB file.
+
+Loads the same shuffled table with and without the sort key and reports the load time and the time
+of a selective scan filtering on the key. Run from the component directory:
+
+    python scripts/benchmark_sort_key.py --rows 5000000
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import duckdb
+from keboola.component.dao import TableDefinition
+
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "src"))
+
+from client.duck import DuckConnection  # noqa: E402
+from configuration import Configuration  # noqa: E402
+
+COLUMNS = {"id": "BIGINT", "day": "DATE", "amount": "DECIMAL(12,2)", "note": "VARCHAR"}
+SCAN_QUERY = "SELECT count(*), sum(amount) FROM bench WHERE day BETWEEN DATE '2022-03-01' AND DATE '2022-03-07'"
+
+
+def generate_csv(path: str, rows: int) -> None:
+    with duckdb.connect() as conn:
+        conn.execute(f"""
+        COPY (
+            SELECT i AS id,
+                   DATE '2020-01-01' + CAST(random() * 1460 AS INTEGER) AS day,
+                   CAST(random() * 10000 AS DECIMAL(12,2)) AS amount,
+                   md5(CAST(i AS VARCHAR)) AS note
+            FROM range({rows}) t(i)
+            ORDER BY random()
+        ) TO '{path}' (HEADER, DELIMITER ',', FORCE_QUOTE *)
+        """)
+
+
+def load(csv_path: str, db_path: str, sort_key: list[str], threads: int, max_memory: int) -> float:
+    params = Configuration(
+        **{
+            "#token": "",
+            "threads": threads,
+            "max_memory": max_memory,
+            "destination": {
+                "table": "bench",
+                "load_type": "full_load",
+                "sort_key": sort_key,
+                "columns": [
+                    {"source_name": c, "destination_name": c, "dtype": t, "pk": False, "nullable": True}
+                    for c, t in COLUMNS.items()
+                ],
+            },
+        }
+    )
+    in_table = TableDefinition("in.csv", full_path=csv_path, schema=list(COLUMNS), has_header=True, stage="in")
+
+    start = time.perf_counter()
+    DuckConnection(params, database=db_path).upload_table(in_table, destination="bench")
+    return time.perf_counter() - start
+
+
+def scan(db_path: str, repeat: int) -> float:
+    with duckdb.connect(db_path, read_only=True) as conn:
+        conn.execute(SCAN_QUERY).fetchall()  # warm-up
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            conn.execute(SCAN_QUERY).fetchall()
+            timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--max-memory", type=int, default=256, help="max_memory in MB, as in the configuration")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_path = os.path.join(tmp_dir, "in.csv")
+        generate_csv(csv_path, args.rows)
+
+        results = {}
+        for label, sort_key in (("unsorted", []), ("sort_key=day", ["day"])):
+            db_path = os.path.join(tmp_dir, f"{label}.duckdb")
+            load_time = load(csv_path, db_path, sort_key, args.threads, args.max_memory)
+            results[label] = (load_time, scan(db_path, args.repeat))
+
+    print(f"{'':<14}{'load [s]':>10}{'scan [ms]':>12}")
+    for label, (load_time, scan_time) in results.items():
+        print(f"{label:<14}{load_time:>10.2f}{scan_time * 1000:>12.2f}")
+
+    (base_load, base_scan), (sorted_load, sorted_scan) = results.values()
+    print(f"Load-time cost: {sorted_load / base_load:.2f}x, scan speedup: {base_scan / sorted_scan:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
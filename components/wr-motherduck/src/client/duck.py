@@ -1,5 +1,6 @@
 import logging
 import os
+from functools import partial
 
 import duckdb
 from keboola.component.dao import (
@@ -7,41 +8,70 @@ from keboola.component.dao import (
 )
 from keboola.component.exceptions import UserException
 
+from client.adaptive import AdaptiveExecutor, partition_filter, range_partition_filter
+from client.extensions import get_extension_config
+from client.type_inference import infer_column_types
+
 DUCK_DB_DIR = os.path.join(os.environ.get("TMPDIR", "/tmp"), "duckdb")
 
 
 class DuckConnection:
-    def __init__(self, params):
+    def __init__(self, params, database: str = "md:"):
+        """
+        Args:
+            params: Component configuration.
+            database: Database to connect to, MotherDuck by default. A local DuckDB file can be used for benchmarks.
+        """
         os.makedirs(DUCK_DB_DIR, exist_ok=True)
         self.params = params
         self.destination = None
 
         config = {
             "temp_directory": DUCK_DB_DIR,
-            "extension_directory": os.path.join(DUCK_DB_DIR, "extensions"),
+            **get_extension_config(fallback_dir=os.path.join(DUCK_DB_DIR, "extensions")),
             "threads": params.threads,
             "max_memory": f"{params.max_memory}MB",
-            "motherduck_token": params.token,
+            "max_temp_directory_size": f"{params.max_spill_size}MB",
             "custom_user_agent": "keboola.wr-motherduck",
         }
+        if database.startswith("md:"):
+            config["motherduck_token"] = params.token
 
         try:
-            self.connection = duckdb.connect(database="md:", config=config)
+            self.connection = duckdb.connect(database=database, config=config)
 
         except Exception:
             raise UserException("Test connection failed, please check your configuration.")
 
-    def upload_table(self, in_table_definition, destination: str):
-        self.destination = destination
+    def upload_table(self, in_table_definition, destination: str, infer_types: bool = False) -> dict:
+        """
+        Loads the input table into the destination table.
 
-        # table name is referenced in the query
-        kbc_input_table_relation = self.create_temp_table(in_table_definition)  # noqa: F841
+        Args:
+            in_table_definition: Input table.
+            destination: Full name of the destination table.
+            infer_types: Narrow VARCHAR columns of the non-typed input table to the inferred types. Applied only
+                when the table is (re)created, the types of an existing table are kept and incremental loads
+                are checked against them.
+
+        Returns:
+            dict: Metrics of the adaptive execution, e.g. the fallbacks used on out of memory errors.
+        """
+        self.destination = destination
 
         try:
+            load_into_existing = self.params.destination.incremental and self._table_exists()
+            if infer_types and not load_into_existing:
+                self._narrow_column_types(in_table_definition)
+
+            kbc_input_table_relation = self.create_temp_table(in_table_definition)
+
             strategy = "INSERT"
             if self.params.destination.incremental:
                 self.create_db_table()
                 self._check_pks_consistency()
+                if load_into_existing:
+                    self._check_column_types(kbc_input_table_relation)
 
                 if [col.destination_name for col in self.params.destination.columns if col.pk]:
                     # if primary key is defined, use UPSERT
@@ -50,18 +80,140 @@ class DuckConnection:
                 self.create_db_table(replace_existing=True)
 
             columns = ", ".join([f"{col.source_name}" for col in self.params.destination.columns])
+            order_by = self._get_order_by_clause()
+
+            # the sort key clustering relies on the insertion order
+            executor = AdaptiveExecutor(self.connection, allow_unordered=not order_by, transactional=True)
+            executor.execute(partial(self._insert, kbc_input_table_relation, strategy, columns, order_by))
+            return executor.metrics
+        except duckdb.ConstraintException as e:
+            raise UserException(f"Error during data load: {e}") from e
+        finally:
+            self.connection.close()
+
+    def _insert(
+        self,
+        kbc_input_table_relation: duckdb.DuckDBPyRelation,  # table name is referenced in the query
+        strategy: str,
+        columns: str,
+        order_by: str,
+        partitions: int,
+    ) -> None:
+        for condition, parameters in self._partition_filters(kbc_input_table_relation, partitions):
+            where = f"WHERE {condition}" if condition else ""
 
             query = f"""
             {strategy} INTO {self.destination}
             SELECT {columns} FROM kbc_input_table_relation
+            {where}
+            {order_by}
             """
 
             logging.debug(f"Executing query: {query}")
-            self.connection.execute(query)
-        except duckdb.ConstraintException as e:
-            raise UserException(f"Error during data load: {e}") from e
-        finally:
-            self.connection.close()
+            self.connection.execute(query, parameters)
+
+    def _partition_filters(
+        self,
+        kbc_input_table_relation: duckdb.DuckDBPyRelation,  # table name is referenced in the query
+        partitions: int,
+    ) -> list[tuple[str, list]]:
+        """
+        Returns the condition and its parameters for each partition of the input rows. With a sort key, the rows
+        are split into ranges of the first sort key column loaded in key order, so the table stays clustered.
+        Otherwise, or when the first sort key column has no values to split by, they are split by the hash of the row.
+        """
+        if partitions == 1:
+            return [("", [])]
+
+        if self.params.destination.sort_key:
+            source_names = {col.destination_name: col.source_name for col in self.params.destination.columns}
+            key = source_names[self.params.destination.sort_key[0]]
+            fractions = ", ".join(str(p / partitions) for p in range(1, partitions))
+            bounds = self.connection.execute(
+                f"SELECT quantile_disc({key}, [{fractions}]) FROM kbc_input_table_relation"
+            ).fetchone()[0]
+            # NULL when all values of the column are NULL
+            if bounds is not None:
+                return [range_partition_filter(key, bounds, p) for p in range(partitions)]
+
+        return [(partition_filter("kbc_input_table_relation", partitions, p), []) for p in range(partitions)]
+
+    def _get_order_by_clause(self) -> str:
+        """
+        Returns ORDER BY clause clustering the loaded rows by the configured sort key, so that row group
+        min/max statistics of the destination table can skip data and upserts probe the index in key order.
+        The sort runs before the insert and spills to the temp directory when it does not fit into max_memory.
+        The sort key columns are validated against the destination columns in the configuration.
+        """
+        sort_key = self.params.destination.sort_key
+        if not sort_key:
+            return ""
+
+        source_names = {col.destination_name: col.source_name for col in self.params.destination.columns}
+        return f"ORDER BY {', '.join(source_names[col] for col in sort_key)}"
+
+    def _table_exists(self) -> bool:
+        try:
+            self.connection.execute(f"SELECT * FROM {self.destination} LIMIT 0")
+            return True
+        except duckdb.CatalogException:
+            return False
+
+    def _check_column_types(
+        self,
+        kbc_input_table_relation: duckdb.DuckDBPyRelation,  # table name is referenced in the query
+    ) -> None:
+        """
+        Checks that the input values fit into the types of the existing destination table. The types can differ
+        from the configured ones, e.g. when they were inferred on the load that created the table.
+        """
+        table_types = {r[0]: r[1] for r in self.connection.execute(f"DESCRIBE {self.destination}").fetchall()}
+        input_types = dict(zip(kbc_input_table_relation.columns, map(str, kbc_input_table_relation.types)))
+        columns = [
+            (col, table_types[col.destination_name])
+            for col in self.params.destination.columns
+            if table_types.get(col.destination_name, input_types[col.source_name]) != input_types[col.source_name]
+        ]
+        if not columns:
+            return
+
+        # the first value of each column that cannot be cast to the table type, all checked in a single scan
+        invalid_values = self.connection.execute(
+            "SELECT "
+            + ", ".join(
+                f"first({col.source_name}) FILTER "
+                f"(WHERE {col.source_name} IS NOT NULL AND TRY_CAST({col.source_name} AS {dtype}) IS NULL)"
+                for col, dtype in columns
+            )
+            + " FROM kbc_input_table_relation"
+        ).fetchone()
+
+        for (col, dtype), value in zip(columns, invalid_values):
+            if value is not None:
+                raise UserException(
+                    f"Value '{value}' of column {col.source_name} does not fit into the type {dtype} "
+                    f"of the destination column {col.destination_name}. Types of an existing table are kept, "
+                    f"use Full Load to recreate the table with new types."
+                )
+
+    def _narrow_column_types(self, table_def: TableDefinition) -> None:
+        """
+        Replaces the VARCHAR type of configured columns with the narrowest type the input data fits into.
+        Columns with type inference disabled keep their type.
+        """
+        inferred_types = infer_column_types(
+            self.connection,
+            path=table_def.full_path,
+            columns=list(table_def.schema),
+            delimiter=table_def.delimiter,
+            quotechar=table_def.enclosure,
+            header=table_def.has_header,
+        )
+        for column in self.params.destination.columns:
+            inferred_type = inferred_types.get(column.source_name, "VARCHAR")
+            if column.infer_type and column.dtype in ("VARCHAR", "STRING") and inferred_type != "VARCHAR":
+                logging.info(f"Column {column.destination_name} will be stored as {inferred_type}")
+                column.dtype = inferred_type
 
     def _check_pks_consistency(self):
         """
@@ -0,0 +1,83 @@
+"""
+DuckDB extension provisioning.
+
+Extensions are installed into EXTENSIONS_DIR when the Docker image is built (`python src/client/extensions.py`),
+so a cold container can load them from disk instead of downloading them on every job and sync action.
+"""
+
+import glob
+import logging
+import os
+import sys
+
+import duckdb
+
+EXTENSIONS_DIR = os.environ.get("DUCKDB_EXTENSIONS_DIR", "/opt/duckdb/extensions")
+REQUIRED_EXTENSIONS = ("motherduck",)
+
+
+def get_duckdb_version() -> str:
+    """
+    Returns the version of the installed duckdb library as used in extension paths, e.g. `v1.4.3`.
+    """
+    return f"v{duckdb.__version__}"
+
+
+def is_provisioned(extensions_dir: str = EXTENSIONS_DIR) -> bool:
+    """
+    Checks that all required extensions are present in the directory for the installed duckdb version.
+    """
+    version = get_duckdb_version()
+    return all(
+        glob.glob(os.path.join(extensions_dir, version, "*", f"{extension}.duckdb_extension"))
+        for extension in REQUIRED_EXTENSIONS
+    )
+
+
+def get_extension_config(fallback_dir: str, extensions_dir: str = EXTENSIONS_DIR) -> dict:
+    """
+    Returns the connection config entries controlling where extensions are loaded from.
+
+    Args:
+        fallback_dir: Extension directory used when the preinstalled extensions are not available.
+        extensions_dir: Directory with extensions preinstalled at build time.
+
+    Returns:
+        dict: Entries to be merged into the duckdb connection config.
+    """
+    if is_provisioned(extensions_dir):
+        # offline-safe: load the preinstalled extensions only, never download at runtime
+        return {
+            "extension_directory": extensions_dir,
+            "autoinstall_known_extensions": False,
+            "autoload_known_extensions": True,
+        }
+
+    logging.warning(f"DuckDB extensions are not preinstalled in {extensions_dir}, they will be downloaded.")
+    return {"extension_directory": fallback_dir}
+
+
+def install_extensions(extensions_dir: str = EXTENSIONS_DIR) -> None:
+    """
+    Installs and loads the required extensions into the directory. Intended to be run at image build time.
+    """
+    os.makedirs(extensions_dir, exist_ok=True)
+
+    with duckdb.connect(config={"extension_directory": extensions_dir}) as conn:
+        for extension in REQUIRED_EXTENSIONS:
+            conn.execute(f"INSTALL {extension};")
+            # warm-up: make sure the extension binary actually loads with this duckdb build
+            conn.execute(f"LOAD {extension};")
+
+    if not is_provisioned(extensions_dir):
+        raise RuntimeError(
+            f"Extensions {REQUIRED_EXTENSIONS} were not installed into {extensions_dir} "
+            f"for duckdb {get_duckdb_version()}."
+        )
+
+    logging.info(f"Extensions {REQUIRED_EXTENSIONS} installed into {extensions_dir} for duckdb {get_duckdb_version()}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    install_extensions(sys.argv[1] if len(sys.argv) > 1 else EXTENSIONS_DIR)
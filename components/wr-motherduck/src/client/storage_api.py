@@ -13,14 +13,21 @@ class SAPIClient:
 
     def get_table_detail(self, table_id):
         url = f"{self.base_url}/v2/storage/tables/{table_id}"
+        return json.loads(self._get(url))
+
+    def get_table_preview(self, table_id, limit=1000):
+        """Returns the first rows of the table as CSV text with header."""
+        url = f"{self.base_url}/v2/storage/tables/{table_id}/data-preview?limit={limit}"
+        return self._get(url)
+
+    def _get(self, url):
         last_exception = None
 
         for attempt in range(self.retry_attempts):
             try:
                 req = urllib.request.Request(url, headers=self.headers)
                 with urllib.request.urlopen(req) as response:
-                    response_data = response.read().decode("utf-8")
-                    return json.loads(response_data)
+                    return response.read().decode("utf-8")
             except Exception as e:
                 last_exception = e
                 logging.warning(f"Attempt {attempt + 1} failed: {e}")
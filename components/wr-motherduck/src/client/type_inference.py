@@ -0,0 +1,148 @@
+"""
+Type inference for non-typed input tables.
+
+Every value of a non-typed Storage table is a string. The inference proposes the narrowest DuckDB type
+each column can be stored as without losing information, in two passes over the CSV:
+
+1. sample pass - the first rows are checked against all candidate types and the narrowest fitting type is proposed,
+2. validation pass - the whole file is checked against the proposed type and the wider candidates, the first one
+   all values fit into is used. Columns no candidate fits stay VARCHAR.
+
+DECIMAL columns always get the maximal precision with the observed scale, so that the type stays stable across loads.
+"""
+
+import logging
+
+import duckdb
+
+SAMPLE_SIZE = 10000
+MAX_DECIMAL_PRECISION = 38
+DEFAULT_TYPE = "VARCHAR"
+# ordered from the narrowest type, a value fitting a type fits the wider numeric / temporal types too
+CANDIDATE_TYPES = ("BOOLEAN", "INTEGER", "BIGINT", "DECIMAL", "DATE", "TIMESTAMP")
+DECIMAL_PATTERN = r"-?(0|[1-9][0-9]*)(\.[0-9]+)?"
+
+
+def _quote(column: str) -> str:
+    return '"{}"'.format(column.replace('"', '""'))
+
+
+def _fits(column: str, dtype: str) -> str:
+    """
+    Returns SQL expression that is true when the (non-null) value can be stored as dtype losslessly.
+    Values must survive the cast round trip, so e.g. `007` or `+1` are not considered integers.
+    """
+    col = _quote(column)
+    if dtype == "BOOLEAN":
+        check = f"CAST(TRY_CAST({col} AS BOOLEAN) AS VARCHAR) = lower({col})"
+    elif dtype == "DECIMAL":
+        check = f"regexp_full_match({col}, '{DECIMAL_PATTERN}')"
+    elif dtype == "TIMESTAMP":
+        # dates are loaded as midnight
+        check = (
+            f"CAST(TRY_CAST({col} AS TIMESTAMP) AS VARCHAR) = {col} OR CAST(TRY_CAST({col} AS DATE) AS VARCHAR) = {col}"
+        )
+    else:
+        check = f"CAST(TRY_CAST({col} AS {dtype}) AS VARCHAR) = {col}"
+    return f"coalesce({check}, false)"
+
+
+def _count_misfits(column: str, dtype: str) -> str:
+    return f"count(*) FILTER (WHERE {_quote(column)} IS NOT NULL AND NOT {_fits(column, dtype)})"
+
+
+def _propose_types(relation: duckdb.DuckDBPyRelation, columns: list[str]) -> dict[str, str]:
+    expressions = []
+    for column in columns:
+        expressions.append(f"count({_quote(column)})")
+        expressions.extend(_count_misfits(column, dtype) for dtype in CANDIDATE_TYPES)
+
+    result = iter(relation.aggregate(", ".join(expressions)).fetchone())
+
+    proposed = {}
+    for column in columns:
+        non_null = next(result)
+        misfits = [next(result) for _ in CANDIDATE_TYPES]
+        # columns without any value in the sample give no evidence
+        fitting = [dtype for dtype, count in zip(CANDIDATE_TYPES, misfits) if count == 0] if non_null else []
+        proposed[column] = fitting[0] if fitting else DEFAULT_TYPE
+    return proposed
+
+
+def _validate_types(relation: duckdb.DuckDBPyRelation, proposed: dict[str, str]) -> dict[str, str]:
+    to_validate = {}
+    for column, dtype in proposed.items():
+        if dtype != DEFAULT_TYPE:
+            # the proposed type and the wider candidates
+            start = CANDIDATE_TYPES.index(dtype)
+            to_validate[column] = CANDIDATE_TYPES[start:]
+    if not to_validate:
+        return proposed
+
+    expressions = []
+    for column, candidates in to_validate.items():
+        col = _quote(column)
+        expressions.extend(_count_misfits(column, dtype) for dtype in candidates)
+        # integer digits and scale, only meaningful for DECIMAL
+        expressions.append(f"max(length(split_part(ltrim({col}, '-'), '.', 1)))")
+        expressions.append(f"max(length(split_part({col}, '.', 2)))")
+
+    result = iter(relation.aggregate(", ".join(expressions)).fetchone())
+
+    validated = dict(proposed)
+    for column, candidates in to_validate.items():
+        misfits = [next(result) for _ in candidates]
+        integer_digits, scale = next(result), next(result)
+
+        fitting = [dtype for dtype, count in zip(candidates, misfits) if count == 0]
+        dtype = fitting[0] if fitting else DEFAULT_TYPE
+        if dtype != candidates[0]:
+            logging.info(f"Column {column} has values not matching {candidates[0]}, using {dtype}.")
+        if dtype == "DECIMAL":
+            dtype = (
+                f"DECIMAL({MAX_DECIMAL_PRECISION},{scale})"
+                if integer_digits + scale <= MAX_DECIMAL_PRECISION
+                else DEFAULT_TYPE
+            )
+        validated[column] = dtype
+    return validated
+
+
+def infer_column_types(
+    connection: duckdb.DuckDBPyConnection,
+    path: str,
+    columns: list[str],
+    delimiter: str = ",",
+    quotechar: str = '"',
+    header: bool = True,
+    sample_size: int = SAMPLE_SIZE,
+) -> dict[str, str]:
+    """
+    Infers the narrowest safe DuckDB type of each column of the CSV file.
+
+    Args:
+        connection: DuckDB connection used to scan the file.
+        path: Path to the CSV file.
+        columns: Names of the columns in the file.
+        delimiter: CSV delimiter.
+        quotechar: CSV enclosure.
+        header: Whether the file has a header row.
+        sample_size: Number of rows used to propose the types.
+
+    Returns:
+        dict: Column name to DuckDB type, VARCHAR for columns that cannot be narrowed.
+    """
+    relation = connection.read_csv(
+        path_or_buffer=path,
+        delimiter=delimiter,
+        quotechar=quotechar,
+        header=header,
+        names=columns,
+        dtype={column: DEFAULT_TYPE for column in columns},
+    )
+
+    proposed = _propose_types(relation.limit(sample_size), columns)
+    inferred = _validate_types(relation, proposed)
+
+    logging.debug(f"Inferred column types: {inferred}")
+    return inferred
@@ -1,12 +1,15 @@
 import logging
+import tempfile
 import time
 
 from keboola.component.base import ComponentBase, sync_action
+from keboola.component.dao import TableDefinition
 from keboola.component.exceptions import UserException
 from keboola.component.sync_actions import SelectElement
 
 from client.duck import DuckConnection
 from client.storage_api import SAPIClient
+from client.type_inference import infer_column_types
 from configuration import ColumnConfig, Configuration
 
 
@@ -24,10 +27,12 @@ class Component(ComponentBase):
         start_time = time.time()
 
         in_table_definition = self._get_in_table()
-        self.db.upload_table(
+        metrics = self.db.upload_table(
             in_table_definition=in_table_definition,
             destination=f'"{self.params.db}"."{self.params.db_schema}"."{self.params.destination.table}"',
+            infer_types=self.params.destination.infer_types and not self._is_typed_input(in_table_definition),
         )
+        self.write_state_file({"metrics": metrics})
 
         logging.debug(f"Execution time: {time.time() - start_time:.2f} seconds")
 
@@ -37,6 +42,14 @@ class Component(ComponentBase):
             raise UserException(f"Exactly one input table is expected. Found: {[t.destination for t in in_tables]}")
         return in_tables[0]
 
+    @staticmethod
+    def _is_typed_input(in_table_definition: TableDefinition) -> bool:
+        """
+        Checks the input table manifest for column types, all columns of a non-typed table are STRING.
+        """
+        base_types = [(column.data_types or {}).get("base") for column in in_table_definition.schema.values()]
+        return any(base_type.dtype != "STRING" for base_type in base_types if base_type)
+
     @staticmethod
     def _map_to_duckdb_type(keboola_type: str) -> str:
         """
@@ -77,11 +90,18 @@ class Component(ComponentBase):
 
         else:  # non-typed table
             primary_keys = set(table_detail.get("primaryKey", []))
+            inferred_types = {}
+            if self.params.destination.infer_types:
+                inferred_types = self._infer_sapi_column_types(
+                    storage_client, table_id, table_detail.get("columns", [])
+                )
+            # the type inferred from the preview is only a hint, the run infers the type from the whole table
             columns_to_process = [
                 {
                     "name": col_name,
                     "dtype": "VARCHAR",
                     "nullable": col_name not in primary_keys,
+                    "inferred_type": inferred_types.get(col_name),
                 }
                 for col_name in table_detail.get("columns", [])
             ]
@@ -97,10 +117,22 @@ class Component(ComponentBase):
                     pk=col_name in primary_keys,
                     nullable=col_info["nullable"],
                     default_value=None,
+                    inferred_type=col_info.get("inferred_type"),
                 ).model_dump()
             )
         return columns
 
+    def _infer_sapi_column_types(self, storage_client: SAPIClient, table_id: str, columns: list[str]) -> dict:
+        """
+        Infers column types of a non-typed table from the Storage data preview.
+        The input table itself is not available in sync actions.
+        """
+        preview = storage_client.get_table_preview(table_id)
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", encoding="utf-8") as preview_file:
+            preview_file.write(preview)
+            preview_file.flush()
+            return infer_column_types(self.db.connection, preview_file.name, columns=columns)
+
     @sync_action("testConnection")
     def test_connection(self):
         pass  # just init connection
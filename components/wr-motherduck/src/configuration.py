@@ -2,7 +2,7 @@ from enum import Enum
 from typing import Optional
 
 from keboola.component.exceptions import UserException
-from pydantic import BaseModel, Field, ValidationError, computed_field
+from pydantic import BaseModel, Field, ValidationError, computed_field, model_validator
 
 
 class LoadType(str, Enum):
@@ -17,12 +17,25 @@ class ColumnConfig(BaseModel):
     pk: bool
     nullable: bool
     default_value: Optional[str] = None
+    infer_type: bool = True
+    inferred_type: Optional[str] = None
 
 
 class Destination(BaseModel):
     table: Optional[str] = None
     columns: list[ColumnConfig] = Field(default_factory=list)
     load_type: LoadType = Field(default=LoadType.incremental_load)
+    infer_types: bool = False
+    sort_key: list[str] = Field(default_factory=list)
+
+    @model_validator(mode="after")
+    def validate_sort_key(self):
+        destination_names = [col.destination_name for col in self.columns]
+        unknown_columns = [col for col in self.sort_key if col not in destination_names]
+        # columns are not defined yet e.g. when loading them in the sync action
+        if self.columns and unknown_columns:
+            raise ValueError(f"Sort key columns {unknown_columns} are not defined in the destination columns.")
+        return self
 
     @computed_field
     def incremental(self) -> bool:
@@ -37,6 +50,7 @@ class Configuration(BaseModel):
     debug: bool = False
     threads: int = 1
     max_memory: int = 256
+    max_spill_size: int = 10240
 
     def __init__(self, **data):
         try:
@@ -0,0 +1,71 @@
+import unittest
+
+import duckdb
+from keboola.component.exceptions import UserException
+
+from src.client.adaptive import AdaptiveExecutor, partition_filter
+
+
+class TestAdaptiveExecutor(unittest.TestCase):
+    def setUp(self):
+        self.connection = duckdb.connect()
+        self.connection.execute("CREATE TABLE src AS SELECT i FROM range(100) t(i);")
+        self.connection.execute("CREATE TABLE dst (i BIGINT);")
+
+    def tearDown(self):
+        self.connection.close()
+
+    def _insert(self, fail_below_partitions: int):
+        def run(partitions: int) -> None:
+            for partition in range(partitions):
+                self.connection.execute(
+                    f"INSERT INTO dst SELECT i FROM src WHERE {partition_filter('src', partitions, partition)}"
+                )
+                if partitions < fail_below_partitions:
+                    raise duckdb.OutOfMemoryException("Out of Memory Error: failed to allocate data")
+
+        return run
+
+    def test_no_fallback_without_error(self):
+        executor = AdaptiveExecutor(self.connection)
+        executor.execute(self._insert(fail_below_partitions=0))
+
+        self.assertEqual(executor.metrics["attempts"], 1)
+        self.assertEqual(executor.metrics["fallbacks"], [])
+
+    def test_falls_back_to_partitions(self):
+        executor = AdaptiveExecutor(self.connection, transactional=True)
+        executor.execute(self._insert(fail_below_partitions=4))
+
+        self.assertEqual(
+            executor.metrics["fallbacks"], ["preserve_insertion_order=false", "partitions=2", "partitions=4"]
+        )
+        self.assertEqual(executor.metrics["partitions"], 4)
+        # failed attempts were rolled back
+        self.assertEqual(self.connection.execute("SELECT count(*), count(DISTINCT i) FROM dst").fetchone(), (100, 100))
+
+    def test_keeps_insertion_order_when_required(self):
+        executor = AdaptiveExecutor(self.connection, allow_unordered=False, transactional=True)
+        executor.execute(self._insert(fail_below_partitions=2))
+
+        self.assertEqual(executor.metrics["fallbacks"], ["partitions=2"])
+        self.assertTrue(self.connection.execute("SELECT current_setting('preserve_insertion_order')").fetchone()[0])
+
+    def test_gives_up_after_max_partitions(self):
+        executor = AdaptiveExecutor(self.connection, transactional=True, max_partitions=4)
+
+        with self.assertRaises(UserException):
+            executor.execute(self._insert(fail_below_partitions=8))
+
+    def test_other_errors_are_not_retried(self):
+        def run(partitions: int) -> None:
+            self.connection.execute("SELECT * FROM missing_table")
+
+        executor = AdaptiveExecutor(self.connection)
+        with self.assertRaises(duckdb.CatalogException):
+            executor.execute(run)
+        self.assertEqual(executor.metrics["attempts"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
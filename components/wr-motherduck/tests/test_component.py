@@ -1,8 +1,10 @@
 import os
 import unittest
+from collections import OrderedDict
 
 import mock
 from freezegun import freeze_time
+from keboola.component.dao import BaseType, ColumnDefinition, TableDefinition
 
 from src.component import Component
 
@@ -17,6 +19,15 @@ class TestComponent(unittest.TestCase):
             comp = Component()
             comp.run()
 
+    def test_typed_input_detected_from_manifest(self):
+        table = TableDefinition("in.csv", schema=["id", "name"], stage="in")
+        self.assertFalse(Component._is_typed_input(table))
+
+        table.schema = OrderedDict(
+            id=ColumnDefinition(data_types=BaseType.integer()), name=ColumnDefinition(data_types=BaseType.string())
+        )
+        self.assertTrue(Component._is_typed_input(table))
+
 
 if __name__ == "__main__":
     # import sys;sys.argv = ['', 'Test.testName']
@@ -0,0 +1,170 @@
+import os
+import random
+import tempfile
+import unittest
+
+import duckdb
+from keboola.component.dao import TableDefinition
+from keboola.component.exceptions import UserException
+
+from src.client.duck import DuckConnection
+from src.configuration import Configuration
+
+
+class TestDuckConnection(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp_dir.name, "test.duckdb")
+        self.csv_path = os.path.join(self.tmp_dir.name, "in.csv")
+        with open(self.csv_path, "w") as f:
+            f.write('"id","day"\n"3","2024-01-03"\n"1","2024-01-01"\n"2","2024-01-02"\n')
+        self.in_table = TableDefinition(
+            "in.csv", full_path=self.csv_path, schema=["id", "day"], has_header=True, stage="in"
+        )
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _params(self, varchar: bool = False, **destination) -> Configuration:
+        params = Configuration(
+            **{
+                "#token": "",
+                "destination": {
+                    "table": "t",
+                    "load_type": "full_load",
+                    "columns": [
+                        {
+                            "source_name": "id",
+                            "destination_name": "id",
+                            "dtype": "INTEGER",
+                            "pk": True,
+                            "nullable": False,
+                        },
+                        {
+                            "source_name": "day",
+                            "destination_name": "day",
+                            "dtype": "DATE",
+                            "pk": False,
+                            "nullable": True,
+                        },
+                    ],
+                    **destination,
+                },
+            }
+        )
+        if varchar:
+            for column in params.destination.columns:
+                column.dtype = "VARCHAR"
+        return params
+
+    def _column_types(self) -> dict:
+        with duckdb.connect(self.db_path) as conn:
+            return {r[0]: r[1] for r in conn.execute("DESCRIBE t").fetchall()}
+
+    def _read_ids(self) -> list:
+        with duckdb.connect(self.db_path) as conn:
+            return [r[0] for r in conn.execute("SELECT id FROM t").fetchall()]
+
+    def test_upload_keeps_input_order_without_sort_key(self):
+        DuckConnection(self._params(), database=self.db_path).upload_table(self.in_table, destination="t")
+
+        self.assertEqual(self._read_ids(), [3, 1, 2])
+
+    def test_upload_sorted_by_sort_key(self):
+        DuckConnection(self._params(sort_key=["day"]), database=self.db_path).upload_table(
+            self.in_table, destination="t"
+        )
+
+        self.assertEqual(self._read_ids(), [1, 2, 3])
+
+    def test_unknown_sort_key_column_fails(self):
+        with self.assertRaises(UserException):
+            self._params(sort_key=["missing"])
+
+    def test_infer_types_narrows_new_table(self):
+        params = self._params(varchar=True, load_type="incremental_load")
+        DuckConnection(params, database=self.db_path).upload_table(self.in_table, destination="t", infer_types=True)
+
+        self.assertEqual(self._column_types(), {"id": "INTEGER", "day": "DATE"})
+
+    def test_infer_types_respects_column_opt_out(self):
+        params = self._params(varchar=True)
+        params.destination.columns[1].infer_type = False
+        DuckConnection(params, database=self.db_path).upload_table(self.in_table, destination="t", infer_types=True)
+
+        self.assertEqual(self._column_types(), {"id": "INTEGER", "day": "VARCHAR"})
+
+    def test_infer_types_keeps_existing_table_types(self):
+        params = self._params(varchar=True, load_type="incremental_load")
+        DuckConnection(params, database=self.db_path).upload_table(self.in_table, destination="t")
+
+        params = self._params(varchar=True, load_type="incremental_load")
+        DuckConnection(params, database=self.db_path).upload_table(self.in_table, destination="t", infer_types=True)
+
+        self.assertEqual(self._column_types(), {"id": "VARCHAR", "day": "VARCHAR"})
+
+    def test_incremental_load_not_fitting_existing_types_fails(self):
+        params = self._params(varchar=True, load_type="incremental_load")
+        DuckConnection(params, database=self.db_path).upload_table(self.in_table, destination="t", infer_types=True)
+
+        with open(self.csv_path, "w") as f:
+            f.write('"id","day"\n"4","2024-01-04"\n"n/a","2024-01-05"\n')
+        params = self._params(varchar=True, load_type="incremental_load")
+        with self.assertRaisesRegex(UserException, "Value 'n/a' of column id does not fit into the type INTEGER"):
+            DuckConnection(params, database=self.db_path).upload_table(self.in_table, destination="t", infer_types=True)
+
+        self.assertEqual(sorted(self._read_ids()), [1, 2, 3])
+
+    def test_incremental_load_fitting_existing_types(self):
+        params = self._params(varchar=True, load_type="incremental_load")
+        DuckConnection(params, database=self.db_path).upload_table(self.in_table, destination="t", infer_types=True)
+
+        with open(self.csv_path, "w") as f:
+            f.write('"id","day"\n"4",""\n')
+        params = self._params(varchar=True, load_type="incremental_load")
+        DuckConnection(params, database=self.db_path).upload_table(self.in_table, destination="t")
+
+        self.assertEqual(sorted(self._read_ids()), [1, 2, 3, 4])
+
+    def _insert_partitioned(self, params: Configuration, partitions: int, empty_days: bool = False) -> list:
+        random.seed(42)
+        days = [f"2024-{random.randint(1, 12):02d}-{random.randint(1, 28):02d}" for _ in range(200)]
+        if empty_days:
+            days = ["" for _ in days]
+        with open(self.csv_path, "w") as f:
+            f.write('"id","day"\n')
+            f.writelines(f'"{i}","{day}"\n' for i, day in enumerate(days))
+            f.write('"200",""\n')
+
+        db = DuckConnection(params, database=self.db_path)
+        db.destination = "t"
+        db.create_db_table(replace_existing=True)
+        relation = db.create_temp_table(self.in_table)
+        db._insert(relation, "INSERT", "id, day", db._get_order_by_clause(), partitions)
+        db.connection.close()
+
+        with duckdb.connect(self.db_path) as conn:
+            return conn.execute("SELECT id, day FROM t").fetchall()
+
+    def test_partitioned_insert_loads_all_rows(self):
+        rows = self._insert_partitioned(self._params(), partitions=4)
+
+        self.assertEqual(sorted(r[0] for r in rows), list(range(201)))
+
+    def test_partitioned_insert_keeps_sort_key_order(self):
+        rows = self._insert_partitioned(self._params(sort_key=["day"]), partitions=4)
+
+        self.assertEqual(sorted(r[0] for r in rows), list(range(201)))
+        days = [r[1] for r in rows]
+        self.assertEqual(days[:-1], sorted(days[:-1]))
+        # NULLs are last, as with a single ORDER BY
+        self.assertIsNone(days[-1])
+
+    def test_partitioned_insert_with_empty_sort_key_column(self):
+        rows = self._insert_partitioned(self._params(sort_key=["day"]), partitions=4, empty_days=True)
+
+        self.assertEqual(sorted(r[0] for r in rows), list(range(201)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import os
+import tempfile
+import time
+import unittest
+
+import duckdb
+from keboola.component.exceptions import UserException
+
+from src.client.duck import DuckConnection
+from src.client.extensions import EXTENSIONS_DIR, get_duckdb_version, get_extension_config, is_provisioned
+from src.configuration import Configuration
+
+
+def _list_files(directory: str) -> dict:
+    return {
+        os.path.join(root, f): os.path.getmtime(os.path.join(root, f))
+        for root, _, files in os.walk(directory)
+        for f in files
+    }
+
+
+class TestExtensions(unittest.TestCase):
+    def test_not_provisioned_falls_back_to_download(self):
+        with tempfile.TemporaryDirectory() as extensions_dir:
+            config = get_extension_config(fallback_dir="/tmp/fallback", extensions_dir=extensions_dir)
+
+        self.assertEqual(config, {"extension_directory": "/tmp/fallback"})
+
+    def test_provisioned_disables_autoinstall(self):
+        with tempfile.TemporaryDirectory() as extensions_dir:
+            platform_dir = os.path.join(extensions_dir, get_duckdb_version(), "linux_amd64")
+            os.makedirs(platform_dir)
+            open(os.path.join(platform_dir, "motherduck.duckdb_extension"), "w").close()
+
+            config = get_extension_config(fallback_dir="/tmp/fallback", extensions_dir=extensions_dir)
+
+        self.assertEqual(config["extension_directory"], extensions_dir)
+        self.assertFalse(config["autoinstall_known_extensions"])
+
+    def test_other_duckdb_version_is_not_provisioned(self):
+        with tempfile.TemporaryDirectory() as extensions_dir:
+            platform_dir = os.path.join(extensions_dir, "v0.0.1", "linux_amd64")
+            os.makedirs(platform_dir)
+            open(os.path.join(platform_dir, "motherduck.duckdb_extension"), "w").close()
+
+            self.assertFalse(is_provisioned(extensions_dir))
+
+    def test_missing_extension_fails_offline(self):
+        with tempfile.TemporaryDirectory() as extensions_dir:
+            platform_dir = os.path.join(extensions_dir, get_duckdb_version(), "linux_amd64")
+            os.makedirs(platform_dir)
+            open(os.path.join(platform_dir, "motherduck.duckdb_extension"), "w").close()
+            files_before = _list_files(extensions_dir)
+
+            config = get_extension_config(fallback_dir="/tmp/fallback", extensions_dir=extensions_dir)
+            with duckdb.connect(config=config) as conn:
+                # httpfs is a known extension autoloaded by reading a remote file, it is not preinstalled
+                with self.assertRaises(duckdb.Error) as context:
+                    conn.execute("SELECT * FROM read_parquet('https://example.com/data.parquet')")
+
+            self.assertEqual(files_before, _list_files(extensions_dir))
+
+        self.assertIn("not found", str(context.exception))
+        self.assertNotIn("Failed to download", str(context.exception))
+
+    @unittest.skipUnless(is_provisioned(EXTENSIONS_DIR), "extensions are preinstalled only in the Docker image")
+    def test_cold_start_makes_no_downloads(self):
+        """
+        Connects to MotherDuck with the component connection config, the extension is autoloaded from disk.
+        Without a valid MOTHERDUCK_TOKEN the connection fails on authentication, after the extension is loaded.
+        """
+        files_before = _list_files(EXTENSIONS_DIR)
+
+        start = time.time()
+        try:
+            with self._connect(os.environ.get("MOTHERDUCK_TOKEN", "invalid-token")) as conn:
+                install_path = conn.execute(
+                    "SELECT install_path FROM duckdb_extensions() WHERE extension_name = 'motherduck'"
+                ).fetchone()[0]
+            elapsed = time.time() - start
+
+            self.assertTrue(install_path.startswith(EXTENSIONS_DIR))
+            self.assertLess(elapsed, 5, f"Cold start took {elapsed:.2f} seconds")
+        except (duckdb.Error, UserException) as e:
+            cause = str(e.__cause__ or e)
+            self.assertNotIn("download", cause.lower())
+            self.assertNotIn("INSTALL motherduck", cause)
+
+        self.assertEqual(files_before, _list_files(EXTENSIONS_DIR))
+
+    def _connect(self, token: str) -> duckdb.DuckDBPyConnection:
+        return DuckConnection(Configuration(**{"#token": token})).connection
+
+
+if __name__ == "__main__":
+    unittest.main()
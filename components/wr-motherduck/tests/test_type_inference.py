@@ -0,0 +1,79 @@
+import os
+import tempfile
+import unittest
+
+import duckdb
+
+from src.client.type_inference import infer_column_types
+
+
+class TestTypeInference(unittest.TestCase):
+    def setUp(self):
+        self.connection = duckdb.connect()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.connection.close()
+        self.tmp_dir.cleanup()
+
+    def _infer(self, columns: list[str], rows: list[list[str]], **kwargs) -> dict:
+        path = os.path.join(self.tmp_dir.name, "in.csv")
+        with open(path, "w") as f:
+            for row in [columns, *rows]:
+                f.write(",".join(f'"{value}"' for value in row) + "\n")
+        return infer_column_types(self.connection, path, columns=columns, **kwargs)
+
+    def test_narrowest_types(self):
+        columns = ["int", "big", "dec", "day", "ts", "flag", "text"]
+        rows = [
+            ["1", "3000000000", "1.5", "2024-01-01", "2024-01-01 10:00:00", "true", "a"],
+            ["-20", "1", "-10.25", "2024-12-31", "2024-01-01 10:00:00.123", "FALSE", "1"],
+        ]
+
+        self.assertEqual(
+            self._infer(columns, rows),
+            {
+                "int": "INTEGER",
+                "big": "BIGINT",
+                "dec": "DECIMAL(38,2)",
+                "day": "DATE",
+                "ts": "TIMESTAMP",
+                "flag": "BOOLEAN",
+                "text": "VARCHAR",
+            },
+        )
+
+    def test_lossy_values_stay_varchar(self):
+        columns = ["leading_zero", "plus_sign", "iso_ts", "numeric_bool"]
+        rows = [["007", "+1", "2024-01-01T10:00:00", "1"], ["1", "2", "2024-01-01T11:00:00", "true"]]
+
+        self.assertEqual(set(self._infer(columns, rows).values()), {"VARCHAR"})
+
+    def test_empty_values_are_ignored(self):
+        rows = [["1", ""], ["", ""], ["3", ""]]
+
+        self.assertEqual(self._infer(["id", "empty"], rows), {"id": "INTEGER", "empty": "VARCHAR"})
+
+    def test_full_validation_rejects_type_proposed_from_sample(self):
+        rows = [[str(i)] for i in range(10)] + [["n/a"]]
+
+        self.assertEqual(self._infer(["id"], rows, sample_size=5), {"id": "VARCHAR"})
+
+    def test_full_validation_widens_type_proposed_from_sample(self):
+        columns = ["id", "amount", "ts"]
+        rows = [[str(i), str(i), f"2024-01-0{i + 1}"] for i in range(5)]
+        rows.append(["3000000000", "1.125", "2024-01-06 10:00:00"])
+
+        self.assertEqual(
+            self._infer(columns, rows, sample_size=5),
+            {"id": "BIGINT", "amount": "DECIMAL(38,3)", "ts": "TIMESTAMP"},
+        )
+
+    def test_decimal_scale_from_full_file(self):
+        rows = [["1.5"], ["2.5"], ["123456.125"]]
+
+        self.assertEqual(self._infer(["amount"], rows, sample_size=2), {"amount": "DECIMAL(38,3)"})
+
+
+if __name__ == "__main__":
+    unittest.main()